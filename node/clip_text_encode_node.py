@@ -4,6 +4,306 @@ CLIP Text Encode (Prompt) Block 節點
 與 ComfyUI 內建 CLIPTextEncode 行為一致，將文字提示編碼為 CONDITIONING。
 歸類在 ✨Prompt Assistant，輸入文字下方可由前端掛載可拖動 grid。
 """
+import copy
+import hashlib
+import os
+import threading
+import weakref
+from collections import OrderedDict, deque
+
+from ..utils import onnx_clip
+from ..utils.common import WARN_PREFIX
+
+# 可選：Rust 實作的 CLIP BPE 分詞器，需設定 PROMPT_BLOCK_FAST_BPE=1 且已安裝 instant_clip_tokenizer；
+# 只處理 ASCII 單詞，且每個 HF 分詞器須先通過一次探測字串比對，token id 完全一致才會替代
+_FAST_BPE = None
+if os.environ.get("PROMPT_BLOCK_FAST_BPE", "0").strip().lower() in ("1", "true", "on"):
+    try:
+        import instant_clip_tokenizer
+        _FAST_BPE = instant_clip_tokenizer.Tokenizer()
+    except Exception:
+        _FAST_BPE = None
+
+
+# CONDITIONING 快取：key=(id(clip), blake2b(text))，命中時跳過 tokenize 與文字編碼器前向
+try:
+    _COND_CACHE_SIZE = max(0, int(os.environ.get("PROMPT_BLOCK_CACHE_SIZE", "64")))
+except ValueError:
+    _COND_CACHE_SIZE = 64
+_COND_CACHE = OrderedDict()
+_COND_CACHE_LOCK = threading.Lock()
+# 已註冊 weakref.finalize 的 CLIP id，CLIP 被回收時清除其所有快取項
+_COND_CACHE_TRACKED = set()
+# 已回收 CLIP 的 id。finalize 回呼可能在持鎖分配記憶體時由 GC 觸發，故只入列不取鎖，
+# 下次存取快取時再清除
+_COND_CACHE_DEAD = deque()
+
+
+def _purge_clip_cache(clip_id):
+    """CLIP 物件被回收時登記其 id，待下次存取快取時移除對應項，避免 id 重用命中過期結果"""
+    _COND_CACHE_DEAD.append(clip_id)
+
+
+def _drain_dead_clips():
+    """移除已回收 CLIP 的快取項，呼叫時須持有 _COND_CACHE_LOCK"""
+    while _COND_CACHE_DEAD:
+        clip_id = _COND_CACHE_DEAD.popleft()
+        _COND_CACHE_TRACKED.discard(clip_id)
+        for key in [k for k in _COND_CACHE if k[0] == clip_id]:
+            del _COND_CACHE[key]
+
+
+def _cache_key(clip, text):
+    return (id(clip), hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest())
+
+
+def _cache_get(key):
+    with _COND_CACHE_LOCK:
+        _drain_dead_clips()
+        conditioning = _COND_CACHE.get(key)
+        if conditioning is not None:
+            _COND_CACHE.move_to_end(key)
+        return conditioning
+
+
+def _cache_put(clip, key, conditioning):
+    if _COND_CACHE_SIZE <= 0:
+        return
+    with _COND_CACHE_LOCK:
+        _drain_dead_clips()
+        if key[0] not in _COND_CACHE_TRACKED:
+            try:
+                weakref.finalize(clip, _purge_clip_cache, key[0])
+            except TypeError:
+                # 不支援弱引用的 CLIP 無法追蹤生命週期，不快取
+                return
+            _COND_CACHE_TRACKED.add(key[0])
+        _COND_CACHE[key] = conditioning
+        _COND_CACHE.move_to_end(key)
+        while len(_COND_CACHE) > _COND_CACHE_SIZE:
+            _COND_CACHE.popitem(last=False)
+
+
+class _FastCLIPTokenizer:
+    """
+    包裝 HF CLIPTokenizer，__call__ 對 ASCII 單詞改用 instant_clip_tokenizer 完成 BPE。
+    ComfyUI 的 SDTokenizer 按空白逐詞調用分詞器，只讀取 input_ids 並去掉首尾的 start/end token，其餘屬性轉交原分詞器。
+    非 ASCII（未安裝 ftfy 時 HF 版會把中日文逐字拆開）及含 HTML 實體的詞（ftfy 會反轉義）交回原分詞器。
+    """
+
+    def __init__(self, tokenizer, start_token, end_token):
+        self._tokenizer = tokenizer
+        self._start = [start_token]
+        self._end = [end_token]
+
+    def __call__(self, text, *args, **kwargs):
+        if not isinstance(text, str) or not text.isascii() or "&" in text:
+            return self._tokenizer(text, *args, **kwargs)
+        return {"input_ids": self._start + _FAST_BPE.encode(text) + self._end}
+
+    def __getattr__(self, name):
+        return getattr(self._tokenizer, name)
+
+
+# HF 分詞器 -> (start, end)，非 CLIP BPE（T5 等）或與 Rust 版結果不一致時記為 None
+_BPE_SPECIAL_TOKENS = weakref.WeakKeyDictionary()
+_CLIP_BPE_VOCAB_SIZE = 49408
+# 比對用探測字串，只含會交給 Rust 版的 ASCII 單詞
+_BPE_PROBES = (
+    "a", "photo", "of", "cat,", "masterpiece,", "best_quality",
+    "(red", "dress:1.2),", "1girl,", "looking_at_viewer", "8k", "UHD!!", "don't", "x-ray",
+)
+
+
+def _clip_bpe_special_tokens(tokenizer):
+    """判斷是否為標準 CLIP BPE 分詞器且 Rust 版結果一致，是則返回 (start, end) token id"""
+    try:
+        return _BPE_SPECIAL_TOKENS[tokenizer]
+    except KeyError:
+        pass
+    except TypeError:
+        return None
+    special = None
+    try:
+        if type(tokenizer).__name__.startswith("CLIPTokenizer") and len(tokenizer.get_vocab()) == _CLIP_BPE_VOCAB_SIZE:
+            ids = tokenizer("")["input_ids"]
+            if len(ids) == 2:
+                special = (ids[0], ids[1])
+        if special is not None:
+            for probe in _BPE_PROBES:
+                if tokenizer(probe)["input_ids"] != [special[0]] + list(_FAST_BPE.encode(probe)) + [special[1]]:
+                    print(f"{WARN_PREFIX} instant_clip_tokenizer 與 ComfyUI 分詞結果不一致，改用原分詞器")
+                    special = None
+                    break
+    except Exception:
+        special = None
+    _BPE_SPECIAL_TOKENS[tokenizer] = special
+    return special
+
+
+# clip.tokenizer -> 子分詞器已替換為 Rust 版的淺拷貝，無可替換者記為 None
+_FAST_TOKENIZERS = weakref.WeakKeyDictionary()
+
+
+def _fast_tokenizer(tokenizer):
+    """
+    返回 clip.tokenizer 的淺拷貝，其中各 CLIP BPE 子分詞器的 HF 分詞器換成 Rust 版。
+    原物件（各 clone 共用）保持不變；T5 等其他分詞器沿用原物件。
+    """
+    try:
+        return _FAST_TOKENIZERS[tokenizer]
+    except KeyError:
+        pass
+    fast = copy.copy(tokenizer)
+    swapped = False
+    for name, sub in vars(tokenizer).items():
+        hf_tokenizer = getattr(sub, "tokenizer", None)
+        if hf_tokenizer is None or not hasattr(sub, "tokens_start"):
+            continue
+        special = _clip_bpe_special_tokens(hf_tokenizer)
+        if special is not None:
+            sub = copy.copy(sub)
+            sub.tokenizer = _FastCLIPTokenizer(hf_tokenizer, *special)
+            setattr(fast, name, sub)
+            swapped = True
+    _FAST_TOKENIZERS[tokenizer] = fast if swapped else None
+    return _FAST_TOKENIZERS[tokenizer]
+
+
+def _tokenize(clip, text):
+    """
+    tokenize 提示詞；啟用 Rust 版 BPE 時，以替換過分詞器的 CLIP 淺拷貝執行，不修改共用的原物件。
+    權重語法、embedding 與 77 token 分窗仍由 ComfyUI 處理。
+    """
+    if _FAST_BPE is not None:
+        try:
+            fast = _fast_tokenizer(clip.tokenizer)
+        except Exception:
+            fast = None
+        if fast is not None:
+            view = copy.copy(clip)
+            view.tokenizer = fast
+            return view.tokenize(text)
+    return clip.tokenize(text)
+
+
+def _resolve_encode_fn(clip):
+    """取得 CLIP 的編碼函式，相容新舊 ComfyUI：優先使用 encode_from_tokens_scheduled"""
+    encode_fn = getattr(clip, "encode_from_tokens_scheduled", None) or getattr(clip, "encode_from_tokens", None)
+    if encode_fn is None:
+        raise RuntimeError("此 CLIP 實例不支援 encode_from_tokens_scheduled 或 encode_from_tokens")
+    return encode_fn
+
+
+# 文字編碼器混合精度：PROMPT_BLOCK_AUTOCAST=bf16|fp16|off（預設 off，部分自訂 CLIP 已量化）
+_AUTOCAST = os.environ.get("PROMPT_BLOCK_AUTOCAST", "off").strip().lower()
+
+
+def _with_autocast(clip, encode_fn):
+    """
+    依設定以 torch.autocast 包裝編碼函式。裝置取自 CLIP 的 load_device（編碼時才會載入到該裝置）；
+    CUDA 上 bf16 不支援時退回 fp16，CPU 僅支援 bf16，其他情況原樣返回。
+    """
+    if _AUTOCAST not in ("bf16", "fp16"):
+        return encode_fn
+    import torch
+    device = getattr(getattr(clip, "patcher", None), "load_device", None)
+    if device is None:
+        try:
+            device = next(clip.cond_stage_model.parameters()).device
+        except Exception:
+            return encode_fn
+    device_type = getattr(device, "type", str(device))
+    if device_type == "cuda":
+        use_bf16 = _AUTOCAST == "bf16" and torch.cuda.is_bf16_supported()
+        dtype = torch.bfloat16 if use_bf16 else torch.float16
+    elif device_type == "cpu" and _AUTOCAST == "bf16":
+        dtype = torch.bfloat16
+    else:
+        return encode_fn
+
+    def _encode(tokens):
+        # 先在 autocast 外載入模型並套用 LoRA 等權重補丁，避免合併後的權重以低精度留在共用的 patcher 上；
+        # 之後編碼函式內的 load_model_gpu 發現已載入便不會重新補丁
+        load_model = getattr(clip, "load_model", None)
+        if load_model is not None:
+            load_model()
+        with torch.autocast(device_type=device_type, dtype=dtype):
+            return encode_fn(tokens)
+    return _encode
+
+
+# 每個 CLIP 的空字串編碼結果：(tokens, CONDITIONING)，常見於未使用的負面提示詞
+_EMPTY_COND = weakref.WeakKeyDictionary()
+
+
+def _empty_conditioning(clip, text):
+    """
+    空白提示詞的快速路徑：每個 CLIP 只編碼一次空字串並保留結果。
+    純空白文字需 tokenize 結果與空字串相同才重用（LLM 類編碼器會把空白當作 token），否則返回 None。
+    """
+    try:
+        entry = _EMPTY_COND.get(clip)
+    except TypeError:
+        return None
+    if entry is None:
+        tokens = _tokenize(clip, "")
+        entry = (tokens, _with_autocast(clip, _resolve_encode_fn(clip))(tokens))
+        _EMPTY_COND[clip] = entry
+    empty_tokens, conditioning = entry
+    if text:
+        try:
+            if _tokenize(clip, text) != empty_tokens:
+                return None
+        except Exception:
+            return None
+    return conditioning
+
+
+# 前綴重用（實驗性）：僅重新編碼與上次不同的 token 視窗，需設定 PROMPT_BLOCK_PREFIX_REUSE=1
+_PREFIX_REUSE = os.environ.get("PROMPT_BLOCK_PREFIX_REUSE", "0").strip().lower() in ("1", "true", "on")
+
+
+def _window_count(tokens):
+    """各編碼器鍵（如 l/g）的視窗數一致時回傳該數，否則回傳 None"""
+    counts = set()
+    for windows in tokens.values():
+        if not isinstance(windows, list):
+            return None
+        counts.add(len(windows))
+    return counts.pop() if len(counts) == 1 else None
+
+
+def common_prefix_len(prev_tokens, tokens):
+    """
+    計算兩次 tokenize 結果共同的前綴視窗數 r。
+    ComfyUI 以 77 token 為一個視窗分別編碼再沿序列維度拼接，相同視窗的輸出可直接重用。
+    """
+    if not isinstance(prev_tokens, dict) or prev_tokens.keys() != tokens.keys():
+        return 0
+    r = None
+    try:
+        for key, windows in tokens.items():
+            n = 0
+            for prev, cur in zip(prev_tokens[key], windows):
+                if prev != cur:
+                    break
+                n += 1
+            r = n if r is None else min(r, n)
+    except Exception:
+        # 含 embedding 張量等無法直接比較的 token 時放棄重用
+        return 0
+    return r or 0
+
+
+def _single_cond(conditioning):
+    """取出僅含 pooled_output 的單一 CONDITIONING 項，其餘結構（hooks 排程等）不支援重用"""
+    if not isinstance(conditioning, list) or len(conditioning) != 1:
+        return None
+    cond, meta = conditioning[0]
+    if set(meta) - {"pooled_output"}:
+        return None
+    return cond, meta
 
 
 class CLIPTextEncodePromptBlock:
@@ -34,19 +334,97 @@ class CLIPTextEncodePromptBlock:
     CATEGORY = "✨Prompt Assistant"
     OUTPUT_NODE = False
 
-    def encode(self, clip, text):
+    # 本節點實例上一次編碼的結果，供前綴重用：{"clip": weakref, "tokens", "cond"}
+    # ComfyUI 依節點 id 重用節點實例，正/負面提示詞節點各自保留自己的上一次結果
+    _past = None
+
+    def _encode_with_prefix(self, clip, tokens, encode_fn):
+        """
+        與上次 tokens 共用前 r 個視窗時，只編碼其後的視窗並與快取的前綴拼接。
+        前綴視窗包含第一個視窗，pooled_output 沿用快取值。無法重用時回傳 None。
+        """
+        past = self._past
+        if past is None or past["clip"]() is not clip:
+            return None
+        n_new = _window_count(tokens)
+        n_prev = _window_count(past["tokens"])
+        if not n_new or not n_prev:
+            return None
+        r = common_prefix_len(past["tokens"], tokens)
+        if r == 0:
+            return None
+        prev = _single_cond(past["cond"])
+        if prev is None or prev[0].shape[1] % n_prev:
+            return None
+        prev_cond, prev_meta = prev
+        width = prev_cond.shape[1] // n_prev
+        head = prev_cond[:, :r * width]
+        if r >= n_new:
+            return [[head, dict(prev_meta)]]
+
+        tail = _single_cond(encode_fn({key: windows[r:] for key, windows in tokens.items()}))
+        if tail is None or tail[0].shape[1] != (n_new - r) * width:
+            return None
+        import torch
+        tail_cond = tail[0]
+        cond = torch.cat((head.to(device=tail_cond.device, dtype=tail_cond.dtype), tail_cond), dim=1)
+        return [[cond, dict(prev_meta)]]
+
+    def _encode_one(self, clip, tokens, encode_fn):
+        conditioning = onnx_clip.encode(clip, tokens)
+        if conditioning is not None:
+            return conditioning
+        if _PREFIX_REUSE:
+            conditioning = self._encode_with_prefix(clip, tokens, encode_fn)
+        if conditioning is None:
+            conditioning = encode_fn(tokens)
+        if _PREFIX_REUSE:
+            try:
+                self._past = {"clip": weakref.ref(clip), "tokens": tokens, "cond": conditioning}
+            except TypeError:
+                self._past = None
+        return conditioning
+
+    def _encode_batch(self, clip, texts):
+        """
+        編碼多個提示詞，返回對應的 CONDITIONING 列表。
+        空白提示詞與命中快取的直接返回，同一批內重複的只編碼一次，其餘逐一編碼。
+        """
         if clip is None:
             raise RuntimeError(
                 "CLIP 輸入無效（為 None）。\n"
                 "若 CLIP 來自 Checkpoint Loader，請確認該 checkpoint 包含有效的 CLIP/文字編碼器。"
             )
-        tokens = clip.tokenize(text)
-        # 相容新舊 ComfyUI：優先使用 encode_from_tokens_scheduled
-        encode_fn = getattr(clip, "encode_from_tokens_scheduled", None) or getattr(clip, "encode_from_tokens", None)
-        if encode_fn is None:
-            raise RuntimeError("此 CLIP 實例不支援 encode_from_tokens_scheduled 或 encode_from_tokens")
-        conditioning = encode_fn(tokens)
-        return (conditioning,)
+        keys = [None] * len(texts)
+        results = [None] * len(texts)
+        for i, text in enumerate(texts):
+            if not text or text.isspace():
+                results[i] = _empty_conditioning(clip, text)
+            if results[i] is None:
+                keys[i] = _cache_key(clip, text)
+                results[i] = _cache_get(keys[i])
+        # 同一批內重複的提示詞只編碼一次
+        pending = {}
+        for i, conditioning in enumerate(results):
+            if conditioning is None:
+                pending.setdefault(keys[i], i)
+        if not pending:
+            return results
+
+        misses = list(pending.values())
+        encode_fn = _with_autocast(clip, _resolve_encode_fn(clip))
+        for i in misses:
+            results[i] = self._encode_one(clip, _tokenize(clip, texts[i]), encode_fn)
+
+        for i in misses:
+            _cache_put(clip, keys[i], results[i])
+        for i, key in enumerate(keys):
+            if results[i] is None:
+                results[i] = results[pending[key]]
+        return results
+
+    def encode(self, clip, text):
+        return (self._encode_batch(clip, [text])[0],)
 
 
 NODE_CLASS_MAPPINGS = {
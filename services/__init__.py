@@ -1,7 +1,24 @@
-# 导出服务类
-from .baidu import BaiduTranslateService
-from .google import GoogleTranslateService
-from .llm import LLMService
-from .vlm import VisionService
+# 导出服务类（首次访问时才导入对应模块，避免加载用不到的服务依赖）
+import importlib
 
-__all__ = ['BaiduTranslateService', 'GoogleTranslateService', 'LLMService', 'VisionService'] 
\ No newline at end of file
+_LAZY = {
+    'BaiduTranslateService': '.baidu',
+    'GoogleTranslateService': '.google',
+    'LLMService': '.llm',
+    'VisionService': '.vlm',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
+__all__ = list(_LAZY)
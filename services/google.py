@@ -1,99 +1,233 @@
 """
 Google 翻譯服務
 優先使用 Google Cloud Translation API v2（Basic），需配置 API Key。
-若未配置 API Key，則使用 googletrans 免費庫作為備選。
+若未配置 API Key，則直接異步調用 Google 免費網頁接口，googletrans 僅作為最後備選。
 """
+import hashlib
+import importlib.util
 import random
+import threading
 import time
 import httpx
 import asyncio
+import numpy as np
+from collections import OrderedDict
 from typing import Optional
 
 from ..utils.common import ProgressBar, TASK_TRANSLATE, WARN_PREFIX
+from .core import HTTPClientPool
 
-# 嘗試導入 googletrans（備選方案；與 httpcore>=1.0 不相容時會載入失敗，不應阻斷整個擴展）
-_GOOGLETRANS_IMPORT_ERROR = None
+# ComfyUI 的 PromptServer 只在模組載入時導入一次，用於檢查執行中斷
 try:
-    from googletrans import Translator
-    GOOGLETRANS_AVAILABLE = True
-except Exception as e:
-    GOOGLETRANS_AVAILABLE = False
-    Translator = None
-    _GOOGLETRANS_IMPORT_ERROR = str(e)
+    from server import PromptServer
+except Exception:
+    PromptServer = None
+
+# httpx 的 HTTP/2 支援需要額外安裝 h2，未安裝時退回 HTTP/1.1 keep-alive
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# googletrans 僅作最後備選，依賴鏈較重，首次需要時才導入
+# （與 httpcore>=1.0 不相容時會載入失敗，不應阻斷整個擴展）
+_GOOGLETRANS_LOADED = False
+_GOOGLETRANS_IMPORT_ERROR = None
+Translator = None
+
+
+def _googletrans_available() -> bool:
+    """延遲導入 googletrans，返回是否可用；失敗原因記錄於 _GOOGLETRANS_IMPORT_ERROR"""
+    global _GOOGLETRANS_LOADED, _GOOGLETRANS_IMPORT_ERROR, Translator
+    if not _GOOGLETRANS_LOADED:
+        _GOOGLETRANS_LOADED = True
+        try:
+            from googletrans import Translator
+        except Exception as e:
+            _GOOGLETRANS_IMPORT_ERROR = str(e)
+    return Translator is not None
+
+
+# 共用的 googletrans Translator（複用 service_urls 與 token），非執行緒安全，調用時需持鎖
+_TRANSLATOR = None
+_TRANSLATOR_LOCK = threading.Lock()
+
+
+def _get_translator():
+    """延遲建立共用 Translator，須在持有 _TRANSLATOR_LOCK 時調用"""
+    global _TRANSLATOR
+    if _TRANSLATOR is None:
+        _TRANSLATOR = Translator()
+    return _TRANSLATOR
+
+
+# Google 目標語言碼：zh-TW（繁中）、zh-CN（簡中）、zh 預設簡中、en；auto 映射為空（不傳 source 即為自動檢測）
+# 未列出的語言碼原樣傳遞
+_TO_GOOGLE_LANG = {"zh": "zh-CN", "auto": ""}
+_FROM_GOOGLE_LANG = {"zh": "zh", "zh-CN": "zh", "zh-TW": "zh"}
+# googletrans 語言碼映射（小寫）
+_GOOGLETRANS_LANG = {"zh": "zh-cn", "zh-CN": "zh-cn", "zh-TW": "zh-tw", "en": "en", "auto": "auto"}
 
 
-# Google 目標語言碼：zh-TW（繁中）、zh-CN（簡中）、zh 預設簡中、en
 def _to_google_lang(code: str) -> str:
-    if code in ("zh-TW", "zh-CN"):
-        return code
-    if code == "zh":
-        return "zh-CN"
-    if code == "en":
-        return "en"
-    if code == "auto":
-        return ""  # 不傳 source 即為自動檢測
-    return code
+    return _TO_GOOGLE_LANG.get(code, code)
 
 
 def _from_google_lang(code: str) -> str:
     if not code:
         return "auto"
-    if code.startswith("zh"):
-        return "zh"
-    return code if code == "en" else code
+    lang = _FROM_GOOGLE_LANG.get(code)
+    if lang is None:
+        lang = "zh" if code.startswith("zh") else code
+    return lang
+
+
+def _is_interrupted(cancel_event: Optional[asyncio.Event]) -> bool:
+    """任務被取消或 ComfyUI 執行被中斷時返回 True"""
+    if cancel_event is not None and cancel_event.is_set():
+        return True
+    instance = getattr(PromptServer, "instance", None)
+    return bool(getattr(instance, "execution_interrupted", False))
+
+
+# 進程內翻譯結果快取：key=(blake2b(區塊), 源語言, 目標語言, 後端)，相同區塊重複翻譯時跳過網路請求；
+# 後端（api/free）納入 key，新增或移除 API Key 後不再沿用另一後端的結果
+_TRANS_CACHE_SIZE = 2048
+_TRANS_CACHE = OrderedDict()
+_TRANS_CACHE_LOCK = threading.Lock()
+
+
+def _trans_cache_key(chunk: str, from_lang: str, to_lang: str, backend: str) -> tuple:
+    return (hashlib.blake2b(chunk.encode("utf-8"), digest_size=16).digest(), from_lang, to_lang, backend)
+
+
+def _trans_cache_get(key: tuple) -> Optional[str]:
+    with _TRANS_CACHE_LOCK:
+        translated = _TRANS_CACHE.get(key)
+        if translated is not None:
+            _TRANS_CACHE.move_to_end(key)
+        return translated
+
+
+def _trans_cache_put(key: tuple, translated: str) -> None:
+    with _TRANS_CACHE_LOCK:
+        _TRANS_CACHE[key] = translated
+        _TRANS_CACHE.move_to_end(key)
+        while len(_TRANS_CACHE) > _TRANS_CACHE_SIZE:
+            _TRANS_CACHE.popitem(last=False)
+
+
+# 無 API Key 時使用的免費網頁翻譯接口
+FREE_TRANSLATE_URL = "https://translate.googleapis.com/translate_a/single"
+
+
+# Google 服務常需經系統代理訪問，保留環境變量代理設定
+_CLIENT_OPTIONS = dict(
+    timeout=15.0,
+    http2=_HTTP2_AVAILABLE,
+    trust_env=True,
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=40, keepalive_expiry=60.0),
+)
+
+
+def _on_server_loop() -> bool:
+    """是否運行於 ComfyUI 服務端的常駐事件循環（節點執行時每次都會新建事件循環）"""
+    try:
+        return PromptServer.instance.loop is asyncio.get_running_loop()
+    except Exception:
+        return False
+
+
+def _get_client() -> Optional[httpx.AsyncClient]:
+    """
+    服務端常駐事件循環上返回連接池中的持久連線客戶端，跨請求複用 TCP/TLS 連線；
+    其他事件循環（節點執行）返回 None，由調用方以 async with 建立並關閉臨時客戶端，
+    避免連接池因事件循環變化而丟棄未關閉的客戶端
+    """
+    if not _on_server_loop():
+        return None
+    return HTTPClientPool.get_client(
+        provider="google_translate",
+        base_url="https://translation.googleapis.com",
+        **_CLIENT_OPTIONS,
+    )
 
 
 class GoogleTranslateService:
     """
     Google 翻譯服務
     優先使用 Google Cloud Translation API v2（需 API Key）
-    若無 API Key，則使用 googletrans 免費庫
+    若無 API Key，則使用免費網頁接口（googletrans 為最後備選）
     """
 
     # 單次請求約 5KB 以內較穩妥，與百度分段邏輯類似
     MAX_CHUNK_LEN = 4500
+    # 同時進行的區塊請求數上限
+    MAX_CONCURRENCY = 4
+    # 批次請求中每個區塊的估算額外開銷（JSON 引號、分隔符等）
+    BATCH_ITEM_OVERHEAD = 16
 
     @staticmethod
     def split_text_by_paragraphs(text: str, max_length: int = MAX_CHUNK_LEN):
-        """按段落分割文本，便於長文翻譯"""
+        """
+        按段落分割文本，便於長文翻譯
+        以 numpy 累積和一次算出各行在原文中的結束位置，用 searchsorted 定位每段的切點，
+        再直接對原文切片，換行符隨行保留，不需逐行重新拼接
+        """
         if not text:
             return []
         lines = text.split("\n")
+        # 每行長度 +1（換行符），cs[i] 即第 i+1 行在原文中的起始位置
+        lens = np.fromiter((len(line) + 1 for line in lines), dtype=np.int64, count=len(lines))
+        cs = lens.cumsum()
         chunks = []
-        current = ""
-        for line in lines:
-            if len(line) > max_length:
-                if current:
-                    chunks.append(current)
-                    current = ""
-                rest = line
-                while rest:
-                    chunks.append(rest[:max_length])
-                    rest = rest[max_length:]
-            elif current and (len(current) + len(line) + 1 > max_length):
-                chunks.append(current)
-                current = line
-            else:
-                current = f"{current}\n{line}" if current else line
-        if current:
-            chunks.append(current)
+        start = 0
+        while start < len(lines):
+            if lens[start] - 1 > max_length:
+                # 單行超長，按 max_length 硬切
+                rest = lines[start]
+                chunks.extend(rest[i:i + max_length] for i in range(0, len(rest), max_length))
+                start += 1
+                continue
+            base = cs[start - 1] if start else 0
+            brk = int(np.searchsorted(cs, base + max_length + 1, side="right"))
+            chunks.append(text[base:cs[brk - 1] - 1])
+            start = brk
         return chunks
 
     @staticmethod
-    async def translate_chunk(
+    def pack_batches(chunks: list, max_length: int = MAX_CHUNK_LEN) -> list:
+        """
+        將區塊貪婪裝箱為多個批次，每批總長（含每項開銷）不超過 max_length，
+        以便一次請求翻譯多個區塊。
+        """
+        batches = []
+        current = []
+        current_len = 0
+        for chunk in chunks:
+            size = len(chunk) + GoogleTranslateService.BATCH_ITEM_OVERHEAD
+            if current and current_len + size > max_length:
+                batches.append(current)
+                current = []
+                current_len = 0
+            current.append(chunk)
+            current_len += size
+        if current:
+            batches.append(current)
+        return batches
+
+    @staticmethod
+    async def translate_chunks_batch(
         client: httpx.AsyncClient,
-        chunk: str,
+        chunks: list,
         api_key: str,
         from_lang: str,
         to_lang: str,
         retry_count: int = 2,
-    ) -> str:
-        """翻譯單一區塊"""
+    ) -> list:
+        """以一次請求翻譯多個區塊（v2 的 q 接受陣列），結果按輸入順序返回"""
         target = _to_google_lang(to_lang)
         source = _to_google_lang(from_lang) if from_lang and from_lang != "auto" else None
         url = "https://translation.googleapis.com/language/translate/v2"
         params = {"key": api_key}
-        body = {"q": [chunk], "target": target, "format": "text"}
+        body = {"q": list(chunks), "target": target, "format": "text"}
         if source:
             body["source"] = source
 
@@ -114,9 +248,69 @@ class GoogleTranslateService:
 
                 data = resp.json()
                 trans = data.get("data", {}).get("translations")
-                if not trans or not trans[0].get("translatedText"):
+                if not trans or len(trans) != len(chunks):
+                    raise Exception("Google 翻译: 返回结果为空")
+                results = [t.get("translatedText") or "" for t in trans]
+                if any(not r and c.strip() for r, c in zip(results, chunks)):
+                    raise Exception("Google 翻译: 返回结果为空")
+                return results
+
+            except (httpx.HTTPError, asyncio.TimeoutError) as e:
+                if attempt < retry_count - 1:
+                    print(f"\r{WARN_PREFIX} Google 翻译请求重试 ({attempt + 1}/{retry_count}): {e}")
+                    await asyncio.sleep(1)
+                else:
+                    raise Exception(f"Google 翻译: 网络请求失败 ({type(e).__name__})")
+        raise Exception("Google 翻译: 超过最大重试次数")
+
+    @staticmethod
+    async def translate_chunk(
+        client: httpx.AsyncClient,
+        chunk: str,
+        api_key: str,
+        from_lang: str,
+        to_lang: str,
+        retry_count: int = 2,
+    ) -> str:
+        """翻譯單一區塊"""
+        results = await GoogleTranslateService.translate_chunks_batch(
+            client, [chunk], api_key, from_lang, to_lang, retry_count
+        )
+        return results[0]
+
+    @staticmethod
+    async def free_translate_chunk(
+        client: httpx.AsyncClient,
+        chunk: str,
+        from_lang: str,
+        to_lang: str,
+        retry_count: int = 2,
+    ) -> str:
+        """
+        無 API Key 時使用的免費網頁接口（translate_a/single, client=gtx），直接異步請求。
+        q 放在表單內以 POST 發送，避免長文本 URL 過長。
+        """
+        params = {
+            "client": "gtx",
+            "sl": _to_google_lang(from_lang or "auto") or "auto",
+            "tl": _to_google_lang(to_lang) or "zh-CN",
+            "dt": "t",
+        }
+        for attempt in range(retry_count):
+            try:
+                resp = await client.post(FREE_TRANSLATE_URL, params=params, data={"q": chunk}, timeout=15.0)
+                if resp.status_code != 200:
+                    if attempt < retry_count - 1:
+                        await asyncio.sleep(1)
+                        continue
+                    raise Exception(f"Google 翻译: 免费接口请求失败 ({resp.status_code})")
+
+                data = resp.json()
+                segments = data[0] if data and isinstance(data[0], list) else []
+                translated = "".join(seg[0] for seg in segments if seg and seg[0])
+                if not translated and chunk.strip():
                     raise Exception("Google 翻译: 返回结果为空")
-                return trans[0]["translatedText"]
+                return translated
 
             except (httpx.HTTPError, asyncio.TimeoutError) as e:
                 if attempt < retry_count - 1:
@@ -126,9 +320,63 @@ class GoogleTranslateService:
                     raise Exception(f"Google 翻译: 网络请求失败 ({type(e).__name__})")
         raise Exception("Google 翻译: 超过最大重试次数")
 
+    @staticmethod
+    async def _translate_chunks_concurrently(
+        batches: list,
+        translate_batch,
+        cancel_event: Optional[asyncio.Event] = None,
+        concurrency: int = MAX_CONCURRENCY,
+        pbar: Optional[ProgressBar] = None,
+    ) -> Optional[list]:
+        """
+        以信號量限制並行數，對每個批次調用 translate_batch(batch) -> list，結果按原區塊順序攤平返回。
+        每完成一個批次即更新進度條的已翻譯字符數。
+        任一批次失敗即取消其餘批次並拋出該異常；被中斷時立即取消所有未完成批次並返回 None。
+        """
+        if not batches:
+            return []
+        sem = asyncio.Semaphore(concurrency)
+        translated_batches = [None] * len(batches)
+        interrupted = False
+        chars_done = 0
+
+        async def _bounded(i, batch):
+            nonlocal chars_done
+            async with sem:
+                translated_batches[i] = await translate_batch(batch)
+            if pbar:
+                chars_done += sum(map(len, translated_batches[i]))
+                pbar.set_generating(chars_done)
+                pbar.update(chars_done)
+
+        tasks = [asyncio.create_task(_bounded(i, batch)) for i, batch in enumerate(batches)]
+
+        async def _watch_cancel():
+            nonlocal interrupted
+            while not _is_interrupted(cancel_event):
+                await asyncio.sleep(0.1)
+            interrupted = True
+            for task in tasks:
+                task.cancel()
+
+        watcher = asyncio.create_task(_watch_cancel())
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            if interrupted:
+                return None
+            for task in done:
+                if not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+            return [part for batch in translated_batches for part in batch]
+        finally:
+            watcher.cancel()
+            for task in tasks:
+                task.cancel()
+
     @staticmethod
     async def _translate_with_googletrans(
         text: str,
+        chunks: list,
         from_lang: str,
         to_lang: str,
         pbar: Optional[ProgressBar] = None,
@@ -136,9 +384,9 @@ class GoogleTranslateService:
     ) -> dict:
         """
         使用 googletrans 免費庫進行翻譯（備選方案）
-        支持長文本分段翻譯
+        chunks 為 translate() 已分好的區塊，不再重複分段
         """
-        if not GOOGLETRANS_AVAILABLE:
+        if not _googletrans_available():
             err = _GOOGLETRANS_IMPORT_ERROR or "googletrans 未安裝"
             return {
                 "success": False,
@@ -146,59 +394,34 @@ class GoogleTranslateService:
             }
 
         try:
-            # googletrans 語言碼映射（小寫）
-            lang_map = {
-                "zh": "zh-cn",
-                "zh-CN": "zh-cn",
-                "zh-TW": "zh-tw",
-                "en": "en",
-                "auto": "auto"
-            }
+            lang_map = _GOOGLETRANS_LANG
             src_lang = lang_map.get(from_lang, from_lang.lower() if from_lang else "auto") if from_lang != "auto" else "auto"
             dest_lang = lang_map.get(to_lang, to_lang.lower() if to_lang else "zh-cn")
 
-            # 分段處理長文本（googletrans 單次請求限制約 5000 字符）
-            chunks = GoogleTranslateService.split_text_by_paragraphs(text, max_length=4500)
-            if not chunks:
-                chunks = [text]
-
-            translated_parts = []
             start_time = time.perf_counter()
 
-            # 在線程池中執行同步的 googletrans 調用
-            def _sync_translate_chunk(chunk_text):
-                translator = Translator()
-                result = translator.translate(chunk_text, src=src_lang, dest=dest_lang)
-                return result.text
-
-            # 串行翻譯每個區塊
-            for i, chunk in enumerate(chunks):
-                # 檢查中斷
-                try:
-                    from server import PromptServer
-                    if cancel_event and cancel_event.is_set():
-                        if pbar:
-                            pbar.cancel(f"{WARN_PREFIX} 任务被中断 | 服务:Google 翻译 (googletrans)")
-                        return {"success": False, "error": "任务被中断", "interrupted": True}
-                    if hasattr(PromptServer, "instance") and getattr(PromptServer.instance, "execution_interrupted", False):
-                        if pbar:
-                            pbar.cancel(f"{WARN_PREFIX} 任务被中断 | 服务:Google 翻译 (googletrans)")
-                        return {"success": False, "error": "任务被中断", "interrupted": True}
-                except Exception:
-                    pass
-
-                # 執行翻譯
-                if hasattr(asyncio, "to_thread"):
-                    translated_chunk = await asyncio.to_thread(_sync_translate_chunk, chunk)
-                else:
-                    loop = asyncio.get_event_loop()
-                    translated_chunk = await loop.run_in_executor(None, _sync_translate_chunk, chunk)
-
-                translated_parts.append(translated_chunk)
-
-                # 避免請求過快
-                if i < len(chunks) - 1:
-                    await asyncio.sleep(0.5)
+            if _is_interrupted(cancel_event):
+                if pbar:
+                    pbar.cancel(f"{WARN_PREFIX} 任务被中断 | 服务:Google 翻译 (googletrans)")
+                return {"success": False, "error": "任务被中断", "interrupted": True}
+
+            # 在線程池中執行同步的 googletrans 調用：共用同一個 Translator，整批區塊一次傳入
+            def _sync_translate_chunks(chunk_list):
+                with _TRANSLATOR_LOCK:
+                    results = _get_translator().translate(chunk_list, src=src_lang, dest=dest_lang)
+                return [result.text for result in results]
+
+            # 純空白區塊不送出翻譯，原樣保留
+            translated_parts = list(chunks)
+            pending = [i for i, chunk in enumerate(chunks) if chunk.strip()]
+            pending_chunks = [chunks[i] for i in pending]
+            if hasattr(asyncio, "to_thread"):
+                fresh_parts = await asyncio.to_thread(_sync_translate_chunks, pending_chunks)
+            else:
+                loop = asyncio.get_event_loop()
+                fresh_parts = await loop.run_in_executor(None, _sync_translate_chunks, pending_chunks)
+            for i, part in zip(pending, fresh_parts):
+                translated_parts[i] = part
 
             translated_text = "\n".join(translated_parts)
             elapsed = int((time.perf_counter() - start_time) * 1000)
@@ -242,7 +465,7 @@ class GoogleTranslateService:
         """
         非流式調用 Google 翻譯。
         優先使用 Google Cloud Translation API v2（需 API Key），
-        若無 API Key 則使用 googletrans 免費庫。
+        若無 API Key 則使用免費網頁接口，失敗時退回 googletrans 免費庫。
         返回格式與 BaiduTranslateService 一致。
         """
         from ..config_manager import config_manager
@@ -254,70 +477,65 @@ class GoogleTranslateService:
 
         config = config_manager.get_google_translate_config()
         api_key = (config or {}).get("api_key", "").strip()
-
-        # 如果沒有 API Key，使用 googletrans 備選方案
-        if not api_key:
-            if not GOOGLETRANS_AVAILABLE:
-                hint = "請在 API 管理中配置 Google 翻譯 API Key，或改用百度/Argos 本地翻譯"
-                if _GOOGLETRANS_IMPORT_ERROR:
-                    hint += f"；googletrans 不可用: {_GOOGLETRANS_IMPORT_ERROR}"
-                else:
-                    hint += "；或安裝 googletrans==4.0.0rc1（需 httpcore<1.0，可能與 httpx 衝突）"
-                return {
-                    "success": False,
-                    "error": f"Google 翻译: 未配置 API Key 且 googletrans 備選不可用。{hint}",
-                }
-
-            # 使用 googletrans
-            task_type = task_type or TASK_TRANSLATE
-            pbar = ProgressBar(
-                request_id=request_id,
-                service_name="Google 翻译 (googletrans)",
-                streaming=is_streaming_progress_enabled(),
-                extra_info=f"长度:{len(text)}",
-                task_type=task_type,
-                source=source,
-            )
-            return await GoogleTranslateService._translate_with_googletrans(
-                text, from_lang, to_lang, pbar, cancel_event
-            )
+        streaming = is_streaming_progress_enabled()
 
         task_type = task_type or TASK_TRANSLATE
         chunks = GoogleTranslateService.split_text_by_paragraphs(text)
         if not chunks:
             chunks = [text]
 
-        translated_parts = []
+        # 命中快取的區塊直接使用，純空白區塊原樣保留，只對其餘區塊發送請求
+        backend = "api" if api_key else "free"
+        cache_keys = [_trans_cache_key(chunk, from_lang, to_lang, backend) for chunk in chunks]
+        translated_parts = [
+            chunk if not chunk.strip() else _trans_cache_get(key)
+            for chunk, key in zip(chunks, cache_keys)
+        ]
+        pending = [chunk for chunk, part in zip(chunks, translated_parts) if part is None]
+
+        if api_key:
+            service_name = "Google 翻译"
+            batches = GoogleTranslateService.pack_batches(pending)
+
+            async def _translate_batch(batch):
+                return await GoogleTranslateService.translate_chunks_batch(
+                    client, batch, api_key, from_lang, to_lang
+                )
+        else:
+            # 未配置 API Key：使用免費網頁接口，失敗時再退回 googletrans（若可用）
+            service_name = "Google 翻译 (免费接口)"
+            batches = [[chunk] for chunk in pending]
+
+            async def _translate_batch(batch):
+                return [await GoogleTranslateService.free_translate_chunk(client, batch[0], from_lang, to_lang)]
+
         pbar = ProgressBar(
             request_id=request_id,
-            service_name="Google 翻译",
-            streaming=is_streaming_progress_enabled(),
+            service_name=service_name,
+            streaming=streaming,
             extra_info=f"长度:{len(text)}",
             task_type=task_type,
             source=source,
         )
         start = time.perf_counter()
 
+        client = _get_client()
+        scoped_client = None
+        if client is None:
+            scoped_client = client = httpx.AsyncClient(follow_redirects=True, **_CLIENT_OPTIONS)
         try:
-            async with httpx.AsyncClient(timeout=15.0) as http_client:
-                for i, chunk in enumerate(chunks):
-                    try:
-                        from server import PromptServer
-                        if cancel_event and cancel_event.is_set():
-                            pbar.cancel(f"{WARN_PREFIX} 任务被中断 | 服务:Google 翻译")
-                            return {"success": False, "error": "任务被中断", "interrupted": True}
-                        if hasattr(PromptServer, "instance") and getattr(PromptServer.instance, "execution_interrupted", False):
-                            pbar.cancel(f"{WARN_PREFIX} 任务被中断 | 服务:Google 翻译")
-                            return {"success": False, "error": "任务被中断", "interrupted": True}
-                    except Exception:
-                        pass
-
-                    part = await GoogleTranslateService.translate_chunk(
-                        http_client, chunk, api_key, from_lang, to_lang
-                    )
-                    translated_parts.append(part)
-                    if i < len(chunks) - 1:
-                        await asyncio.sleep(0.3)
+            fresh_parts = await GoogleTranslateService._translate_chunks_concurrently(
+                batches, _translate_batch, cancel_event, pbar=pbar
+            )
+            if fresh_parts is None:
+                pbar.cancel(f"{WARN_PREFIX} 任务被中断 | 服务:{service_name}")
+                return {"success": False, "error": "任务被中断", "interrupted": True}
+            fresh = iter(fresh_parts)
+            for i, part in enumerate(translated_parts):
+                if part is None:
+                    translated_parts[i] = next(fresh)
+                    _trans_cache_put(cache_keys[i], translated_parts[i])
+            # str.join 先算總長再一次分配並複製，已是最省的拼接方式；改用 bytearray 需逐段 encode 再整體 decode，反而更慢更耗記憶體
             translated_text = "\n".join(translated_parts)
             elapsed = int((time.perf_counter() - start) * 1000)
             pbar.done(char_count=len(translated_text), elapsed_ms=elapsed)
@@ -332,12 +550,28 @@ class GoogleTranslateService:
             }
         except asyncio.CancelledError:
             if "pbar" in locals() and pbar:
-                pbar.cancel(f"{WARN_PREFIX} 任务被外部取消 | 服务:Google 翻译")
+                pbar.cancel(f"{WARN_PREFIX} 任务被外部取消 | 服务:{service_name}")
             return {"success": False, "error": "任务被取消", "interrupted": True}
         except Exception as e:
-            if "pbar" in locals() and pbar:
-                pbar.error(str(e))
+            if not api_key and _googletrans_available():
+                # 仍有備選方案時只記警告，不把本次任務記為失敗
+                print(f"\r{WARN_PREFIX} Google 翻译免费接口失败（{e}），改用 googletrans 備選")
+                fallback_pbar = ProgressBar(
+                    request_id=request_id,
+                    service_name="Google 翻译 (googletrans)",
+                    streaming=streaming,
+                    extra_info=f"长度:{len(text)}",
+                    task_type=task_type,
+                    source=source,
+                )
+                return await GoogleTranslateService._translate_with_googletrans(
+                    text, chunks, from_lang, to_lang, fallback_pbar, cancel_event
+                )
+            pbar.error(str(e))
             return {"success": False, "error": str(e)}
+        finally:
+            if scoped_client is not None:
+                await scoped_client.aclose()
 
     @staticmethod
     async def batch_translate(texts: list, from_lang: str = "auto", to_lang: str = "zh"):
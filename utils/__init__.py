@@ -1,5 +1,6 @@
 from . import common
 from . import image
 from . import video
+from . import onnx_clip
 
-__all__ = ['common', 'image', 'video']
+__all__ = ['common', 'image', 'video', 'onnx_clip']
@@ -0,0 +1,221 @@
+"""
+ONNX Runtime CLIP 文本编码工具模块
+设置环境变量 PROMPT_BLOCK_USE_ONNX=1 且已安装 onnxruntime 时，
+将 SD1 类 CLIP-L 文本编码器导出为 ONNX，并用 onnxruntime 推理代替 PyTorch 前向。
+仅处理无权重、无 embedding 的标准 77 token 窗口，其余情况返回 None 交回 ComfyUI 原流程。
+模型导出到内存直接建立推理会话，不写临时文件；权重补丁（LoRA 等）与层设置相同的 CLIP 克隆共用同一会话。
+注意：CUDA/TensorRT 会话在显存中另存一份权重，不受 ComfyUI 模型管理（卸载、显存调度）控制。
+"""
+
+import io
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Optional
+
+from .common import WARN_PREFIX
+
+ENABLED = os.environ.get("PROMPT_BLOCK_USE_ONNX", "0").strip().lower() in ("1", "true", "on")
+
+# 仅在启用时才导入 onnxruntime，未启用的环境不承担导入开销
+ort = None
+if ENABLED:
+    try:
+        import onnxruntime as ort
+    except Exception:
+        ort = None
+
+# 按优先级尝试的执行后端，实际使用与 onnxruntime 可用后端的交集
+_PREFERRED_PROVIDERS = ["TensorrtExecutionProvider", "CUDAExecutionProvider", "CPUExecutionProvider"]
+_WINDOW_LEN = 77
+
+# 文本编码器（或无补丁标识时的 CLIP 实例）-> OrderedDict{(补丁标识, layer 配置): InferenceSession}
+# 每个编码器最多保留 _MAX_SESSIONS 个会话（LRU），避免多份权重常驻显存；导出失败记为 None，不再重试
+_MAX_SESSIONS = 2
+_SESSIONS = weakref.WeakKeyDictionary()
+_SESSIONS_LOCK = threading.Lock()
+# 正在导出的 (编码器 id, 会话 key) -> 锁；导出耗时数秒，只阻塞等待同一会话的调用
+_EXPORT_LOCKS = {}
+
+
+def is_available() -> bool:
+    """是否启用并可使用 ONNX 路径"""
+    return ENABLED and ort is not None
+
+
+def _get_clip_l(clip):
+    """返回 SD1 类模型的 CLIP-L 子模型（SDClipModel），不是则返回 None"""
+    cond_stage_model = getattr(clip, "cond_stage_model", None)
+    clip_name = getattr(cond_stage_model, "clip", None)
+    if clip_name != "clip_l":
+        return None
+    sd_clip = getattr(cond_stage_model, clip_name, None)
+    if getattr(sd_clip, "transformer", None) is None:
+        return None
+    return sd_clip
+
+
+def _layer_options(clip, sd_clip) -> tuple:
+    """
+    与 ComfyUI encode_from_tokens 一致：先取 reset_clip_options 恢复的默认值（options_default），
+    CLIP.layer_idx 有值时再按 set_clip_options 的规则取对应中间层输出。
+    不读取 sd_clip 当前的 layer 属性，它可能仍是上一个 CLIPSetLastLayer 克隆编码时留下的设置
+    """
+    default = getattr(sd_clip, "options_default", None)
+    if default is not None:
+        layer, layer_idx, return_projected_pooled = default[:3]
+    else:
+        layer, layer_idx = getattr(sd_clip, "layer", "last"), getattr(sd_clip, "layer_idx", None)
+        return_projected_pooled = getattr(sd_clip, "return_projected_pooled", True)
+    clip_layer = getattr(clip, "layer_idx", None)
+    if clip_layer is not None and layer != "all":
+        num_layers = getattr(sd_clip, "num_layers", None)
+        if num_layers is not None and abs(clip_layer) > num_layers:
+            layer = "last"
+        else:
+            layer, layer_idx = "hidden", clip_layer
+    return (
+        layer,
+        layer_idx,
+        getattr(sd_clip, "layer_norm_hidden_state", True),
+        return_projected_pooled,
+    )
+
+
+def _token_ids(tokens) -> Optional[list]:
+    """提取纯 token id 窗口；含权重、embedding 或非标准窗口长度时返回 None"""
+    if not isinstance(tokens, dict) or list(tokens.keys()) != ["l"]:
+        return None
+    windows = []
+    for window in tokens["l"]:
+        if len(window) != _WINDOW_LEN:
+            return None
+        ids = []
+        for item in window:
+            token, weight = item[0], item[1]
+            if weight != 1.0 or not isinstance(token, int):
+                return None
+            ids.append(token)
+        windows.append(ids)
+    return windows or None
+
+
+def _export(clip, sd_clip, options) -> Optional[object]:
+    """加载模型（应用 LoRA 等补丁）后导出 ONNX 并创建推理会话"""
+    import torch
+    import comfy.model_management
+
+    layer, layer_idx, layer_norm_hidden_state, return_projected_pooled = options
+
+    class _TextEncoder(torch.nn.Module):
+        def __init__(self, transformer):
+            super().__init__()
+            self.transformer = transformer
+
+        def forward(self, input_ids):
+            outputs = self.transformer(
+                input_ids,
+                intermediate_output=None if layer == "last" else layer_idx,
+                final_layer_norm_intermediate=layer_norm_hidden_state,
+                dtype=torch.float32,
+            )
+            z = outputs[0] if layer == "last" else outputs[1]
+            if not return_projected_pooled and len(outputs) >= 4 and outputs[3] is not None:
+                pooled = outputs[3]
+            else:
+                pooled = outputs[2]
+            return z.float(), pooled.float()
+
+    comfy.model_management.load_model_gpu(clip.patcher)
+    transformer = sd_clip.transformer
+    device = next(transformer.parameters()).device
+    dummy = torch.zeros((1, _WINDOW_LEN), dtype=torch.long, device=device)
+
+    buffer = io.BytesIO()
+    with torch.no_grad():
+        torch.onnx.export(
+            _TextEncoder(transformer).eval(),
+            (dummy,),
+            buffer,
+            input_names=["input_ids"],
+            output_names=["hidden_states", "pooled_output"],
+            dynamic_axes={"input_ids": {0: "batch"}, "hidden_states": {0: "batch"}, "pooled_output": {0: "batch"}},
+            opset_version=17,
+        )
+
+    available = set(ort.get_available_providers())
+    providers = [p for p in _PREFERRED_PROVIDERS if p in available] or None
+    return ort.InferenceSession(buffer.getvalue(), providers=providers)
+
+
+def _get_session(clip, sd_clip, options):
+    """
+    ComfyUI 在切换 LoRA、CLIPSetLastLayer 时会克隆 CLIP，克隆共用同一个文本编码器模块，
+    补丁不同则 patches_uuid 不同；因此以 (patches_uuid, layer 配置) 区分同一编码器的各个会话
+    """
+    patches_uuid = getattr(getattr(clip, "patcher", None), "patches_uuid", None)
+    owner = sd_clip if patches_uuid is not None else clip
+    key = (patches_uuid, options)
+    with _SESSIONS_LOCK:
+        sessions = _SESSIONS.get(owner)
+        if sessions is None:
+            sessions = _SESSIONS[owner] = OrderedDict()
+        if key in sessions:
+            sessions.move_to_end(key)
+            return sessions[key]
+        export_lock = _EXPORT_LOCKS.setdefault((id(owner), key), threading.Lock())
+
+    with export_lock:
+        with _SESSIONS_LOCK:
+            if key in sessions:
+                return sessions[key]
+        try:
+            session = _export(clip, sd_clip, options)
+        except Exception as e:
+            print(f"{WARN_PREFIX} ONNX 文本编码器导出失败，改用 PyTorch: {e}")
+            session = None
+        with _SESSIONS_LOCK:
+            sessions[key] = session
+            while len(sessions) > _MAX_SESSIONS:
+                sessions.popitem(last=False)
+            _EXPORT_LOCKS.pop((id(owner), key), None)
+    return session
+
+
+def encode(clip, tokens):
+    """
+    用 ONNX Runtime 编码 tokens，返回与 encode_from_tokens_scheduled 相同结构的 CONDITIONING；
+    不适用时返回 None
+    """
+    if not is_available():
+        return None
+    # 挂载了 hooks 的 CLIP 需要 ComfyUI 的排程编码，不走 ONNX
+    if getattr(clip, "apply_hooks_to_conds", None):
+        return None
+    sd_clip = _get_clip_l(clip)
+    if sd_clip is None:
+        return None
+    windows = _token_ids(tokens)
+    if windows is None:
+        return None
+    options = _layer_options(clip, sd_clip)
+    if options[0] not in ("last", "hidden"):
+        return None
+    try:
+        session = _get_session(clip, sd_clip, options)
+    except TypeError:
+        # CLIP 不支持弱引用
+        return None
+    if session is None:
+        return None
+
+    import numpy as np
+    import torch
+    import comfy.model_management
+
+    hidden, pooled = session.run(None, {"input_ids": np.asarray(windows, dtype=np.int64)})
+    device = comfy.model_management.intermediate_device()
+    cond = torch.from_numpy(hidden).reshape(1, -1, hidden.shape[-1]).to(device)
+    pooled = torch.from_numpy(pooled[0:1]).to(device)
+    return [[cond, {"pooled_output": pooled}]]